@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import functools
+import pickle
+from array import array
+from pathlib import Path
+from typing import Tuple
+
+GRID_SIZE = 4
+
+# Bump when the table layout or merge rules change; stale cache files
+# with other versions are simply ignored.
+LUT_VERSION = 2
+_CACHE_PATH = Path.home() / ".cache" / "tui48" / f"lut-v{LUT_VERSION}.pkl"
+
+Tables = Tuple[array, array, array, array, array]
+
+
+def _reverse_row(row: int) -> int:
+    return (
+        ((row & 0x000F) << 12)
+        | ((row & 0x00F0) << 4)
+        | ((row & 0x0F00) >> 4)
+        | ((row & 0xF000) >> 12)
+    )
+
+
+def _merge_row_left(row: int) -> int:
+    # Compact non-zero nibbles with a branchless index update, then walk
+    # adjacent pairs; values are log2 exponents, so a merge is +1.
+    packed = [0, 0, 0, 0]
+    k = 0
+    for c in range(GRID_SIZE):
+        n = (row >> (4 * c)) & 0xF
+        packed[k] = n
+        k += n != 0
+    result = 0
+    i = 0
+    shift = 0
+    while i < k:
+        if i + 1 < k and packed[i] == packed[i + 1]:
+            result |= min(packed[i] + 1, 0xF) << shift
+            i += 2
+        else:
+            result |= packed[i] << shift
+            i += 1
+        shift += 4
+    return result
+
+
+def _unpack_column(row: int) -> int:
+    # Spread nibble c of a row result to bit 16 * c, i.e. down column 0.
+    return (
+        (row & 0x000F)
+        | ((row & 0x00F0) << 12)
+        | ((row & 0x0F00) << 24)
+        | ((row & 0xF000) << 36)
+    )
+
+
+def _build_tables() -> Tables:
+    row_left = array("H", (_merge_row_left(row) for row in range(1 << 16)))
+    row_right = array(
+        "H", (_reverse_row(row_left[_reverse_row(row)]) for row in range(1 << 16))
+    )
+    col_up = array("Q", (_unpack_column(row) for row in row_left))
+    col_down = array("Q", (_unpack_column(row) for row in row_right))
+    row_max = array(
+        "B",
+        (
+            max((row >> (4 * c)) & 0xF for c in range(GRID_SIZE))
+            for row in range(1 << 16)
+        ),
+    )
+    return row_left, row_right, col_up, col_down, row_max
+
+
+@functools.cache
+def load_tables() -> Tables:
+    try:
+        with _CACHE_PATH.open("rb") as fh:
+            return pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    tables = _build_tables()
+    try:
+        _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with _CACHE_PATH.open("wb") as fh:
+            pickle.dump(tables, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return tables
+
+
+ROW_LEFT, ROW_RIGHT, COL_UP, COL_DOWN, ROW_MAX = load_tables()
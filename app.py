@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import functools
 import random
-from typing import List, Tuple
+from typing import List
+
+from rich.style import Style
+from rich.text import Text
 
 from textual.app import App, ComposeResult
-from textual.containers import Container, Grid, Horizontal
+from textual.containers import Container, Horizontal
 from textual.screen import ModalScreen
 from textual.widgets import Footer, Header, Static, Button
 from textual.events import Key
 
+import engine
+
 GRID_SIZE = 4
 
 
+# pad_lines only ever sees a small closed set of strings (tile values,
+# status messages, heart frames), so memoizing keeps the splitlines/join
+# work off the render path.
+@functools.lru_cache(maxsize=512)
 def pad_lines(text: str, height: int) -> str:
     lines = text.splitlines() if text else [""]
     if len(lines) >= height:
@@ -22,49 +32,91 @@ def pad_lines(text: str, height: int) -> str:
     return "\n".join([""] * top + lines + [""] * bottom)
 
 
-class Tile(Static):
-    VALUE_CLASSES = [
-        "v0",
-        "v2",
-        "v4",
-        "v8",
-        "v16",
-        "v32",
-        "v64",
-        "v128",
-        "v256",
-        "v512",
-        "v1024",
-        "v2048",
+_CELL_WIDTH = 13
+_CELL_HEIGHT = 5
+
+# (background, color) per value, matching the former Tile.vN stylesheet
+# rules; values past 2048 reuse the 2048 colors.
+_CELL_COLORS = {
+    0: ("#ffe9f1", "#ffe9f1"),
+    2: ("#ffe0ec", "#6b1235"),
+    4: ("#ffd4e5", "#6b1235"),
+    8: ("#ffbfd6", "#5a0f2c"),
+    16: ("#ffabc8", "#510f28"),
+    32: ("#ff97ba", "#4a0f24"),
+    64: ("#ff84ad", "#3f0c1f"),
+    128: ("#ff6f9e", "#3f0c1f"),
+    256: ("#ff5b90", "#3f0c1f"),
+    512: ("#ff477f", "#fff5f8"),
+    1024: ("#f53370", "#fff5f8"),
+    2048: ("#e11f63", "#fff5f8"),
+}
+
+
+@functools.cache
+def _build_cell(value: int) -> List[Text]:
+    background, color = _CELL_COLORS.get(value, _CELL_COLORS[2048])
+    style = Style(color=color, bgcolor=background, bold=True)
+    label = "" if value == 0 else str(value)
+    blank = " " * _CELL_WIDTH
+    return [
+        Text(label.center(_CELL_WIDTH) if line == _CELL_HEIGHT // 2 else blank,
+             style=style)
+        for line in range(_CELL_HEIGHT)
     ]
 
-    def __init__(self) -> None:
-        super().__init__(classes="fill-text")
-
-    def set_value(self, value: int) -> None:
-        for cls in self.VALUE_CLASSES:
-            self.remove_class(cls)
-        if value == 0:
-            self.add_class("v0")
-            self.update(pad_lines("", 5))
-        else:
-            self.add_class(f"v{value}")
-            self.update(pad_lines(str(value), 5))
 
+_CELL_LINES = {value: _build_cell(value) for value in _CELL_COLORS}
 
-class Board(Grid):
+_KEYMAP = {
+    "up": "up",
+    "w": "up",
+    "k": "up",
+    "down": "down",
+    "s": "down",
+    "j": "down",
+    "left": "left",
+    "a": "left",
+    "h": "left",
+    "right": "right",
+    "d": "right",
+    "l": "right",
+}
+
+
+class Board(Static):
+    # A single widget holding the whole grid as one pre-styled Text:
+    # one update per move instead of sixteen tile updates.
     def __init__(self) -> None:
         super().__init__(id="board")
-        self.tiles: List[Tile] = [Tile() for _ in range(GRID_SIZE * GRID_SIZE)]
 
-    def compose(self) -> ComposeResult:
-        for tile in self.tiles:
-            yield tile
-
-    def render_board(self, grid: List[List[int]]) -> None:
+    # Boards are hashable ints and the cell fragments are shared, so
+    # repeated positions hand the exact same Text object to update().
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _render_text(board: int) -> Text:
+        lines: List[Text] = []
         for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                self.tiles[r * GRID_SIZE + c].set_value(grid[r][c])
+            if r:
+                lines.append(Text())  # gutter row showing the board background
+            for line in range(_CELL_HEIGHT):
+                row_text = Text(no_wrap=True)
+                for c in range(GRID_SIZE):
+                    if c:
+                        row_text.append(" ")
+                    exponent = (board >> (4 * (r * GRID_SIZE + c))) & 0xF
+                    value = 0 if exponent == 0 else 1 << exponent
+                    cell = _CELL_LINES.get(value)
+                    if cell is None:
+                        cell = _build_cell(value)
+                    row_text.append_text(cell[line])
+                lines.append(row_text)
+        return Text("\n", no_wrap=True).join(lines)
+
+    def render_board(self, old_board: int, new_board: int) -> None:
+        if old_board == new_board:
+            return
+        self.update(self._render_text(new_board))
 
 
 class Game2048(App):
@@ -72,9 +124,10 @@ class Game2048(App):
 
     def __init__(self) -> None:
         super().__init__()
-        self.grid: List[List[int]] = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.board: int = 0
+        self._prev_board: int = 0
         self.score = 0
-        self.board = Board()
+        self.board_widget = Board()
         self.score_widget = Static(id="score", classes="fill-text")
         self.status_widget = Static(id="status", classes="fill-text")
         self.won = False
@@ -89,7 +142,7 @@ class Game2048(App):
                     classes="fill-text",
                 )
                 yield self.score_widget
-                yield self.board
+                yield self.board_widget
                 yield self.status_widget
         yield Footer()
 
@@ -98,91 +151,49 @@ class Game2048(App):
 
     def on_key(self, event: Key) -> None:
         key = event.key
-        if key in {"up", "w", "k"}:
-            self.move("up")
-        elif key in {"down", "s", "j"}:
-            self.move("down")
-        elif key in {"left", "a", "h"}:
-            self.move("left")
-        elif key in {"right", "d", "l"}:
-            self.move("right")
-        elif key in {"r"}:
+        if key == "r":
             self.reset_game()
-        elif key in {"q", "escape"}:
+        elif key == "q" or key == "escape":
             self.exit()
+        else:
+            direction = _KEYMAP.get(key)
+            if direction is not None:
+                self.move(direction)
 
     def reset_game(self) -> None:
-        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.board = 0
         self.score = 0
         self.won = False
         self.add_random_tile()
         self.add_random_tile()
+        # Complement every nibble so the diff render touches all 16 tiles.
+        self._prev_board = ~self.board & 0xFFFFFFFFFFFFFFFF
         self.update_score()
         self.update_ui("NEW GAME! USE ARROWS/WASD. R TO RESTART, Q TO QUIT. ❤")
 
     def update_ui(self, status: str | None = None) -> None:
-        self.board.render_board(self.grid)
+        self.board_widget.render_board(self._prev_board, self.board)
+        self._prev_board = self.board
         self.score_widget.update(pad_lines(f"HIGHEST TILE: {self.score}   ❤", 4))
         if status is not None:
             self.status_widget.update(pad_lines(status, 4))
 
     def add_random_tile(self) -> None:
-        empties: List[Tuple[int, int]] = [
-            (r, c)
-            for r in range(GRID_SIZE)
-            for c in range(GRID_SIZE)
-            if self.grid[r][c] == 0
-        ]
-        if not empties:
+        zeros = int(engine.empty_mask(self.board))
+        if zeros == 0:
             return
-        r, c = random.choice(empties)
-        self.grid[r][c] = 4 if random.random() < 0.1 else 2
+        # One RNG draw instead of two: the low 10 bits decide the 90/10
+        # two-versus-four split (102/1024), the rest pick which empty
+        # nibble, selected by clearing k low set bits.
+        bits = random.getrandbits(32)
+        for _ in range((bits >> 10) % zeros.bit_count()):
+            zeros &= zeros - 1
+        exponent = 2 if (bits & 0x3FF) < 102 else 1
+        self.board |= exponent << ((zeros & -zeros).bit_length() - 1)
 
     def move(self, direction: str) -> None:
-        moved = False
-
-        def merge_line(line: List[int]) -> Tuple[List[int], int, bool]:
-            original = list(line)
-            numbers = [n for n in line if n != 0]
-            merged: List[int] = []
-            score_gained = 0
-            i = 0
-            while i < len(numbers):
-                if i + 1 < len(numbers) and numbers[i] == numbers[i + 1]:
-                    value = numbers[i] * 2
-                    merged.append(value)
-                    score_gained += value
-                    i += 2
-                else:
-                    merged.append(numbers[i])
-                    i += 1
-            merged.extend([0] * (GRID_SIZE - len(merged)))
-            return merged, score_gained, merged != original
-
-        def get_line(index: int) -> List[int]:
-            if direction in {"left", "right"}:
-                line = list(self.grid[index])
-                return list(reversed(line)) if direction == "right" else line
-            line = [self.grid[r][index] for r in range(GRID_SIZE)]
-            return list(reversed(line)) if direction == "down" else line
-
-        def set_line(index: int, line: List[int]) -> None:
-            if direction in {"left", "right"}:
-                if direction == "right":
-                    line = list(reversed(line))
-                self.grid[index] = line
-            else:
-                if direction == "down":
-                    line = list(reversed(line))
-                for r in range(GRID_SIZE):
-                    self.grid[r][index] = line[r]
-
-        for i in range(GRID_SIZE):
-            line = get_line(i)
-            merged, _score_gained, line_moved = merge_line(line)
-            set_line(i, merged)
-            if line_moved:
-                moved = True
+        new_board, moved = engine.move(self.board, direction)
+        self.board = new_board
 
         if moved:
             self.add_random_tile()
@@ -197,19 +208,14 @@ class Game2048(App):
                 self.update_ui("GAME OVER. PRESS R TO RESTART. ❤")
 
     def is_game_over(self) -> bool:
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                value = self.grid[r][c]
-                if value == 0:
-                    return False
-                if r + 1 < GRID_SIZE and self.grid[r + 1][c] == value:
-                    return False
-                if c + 1 < GRID_SIZE and self.grid[r][c + 1] == value:
-                    return False
-        return True
+        return engine.game_over(self.board)
 
     def update_score(self) -> None:
-        self.score = max(max(row) for row in self.grid)
+        # Monotonic within a game, so most moves change nothing here.
+        exponent = int(engine.highest_exponent(self.board))
+        value = 0 if exponent == 0 else 1 << exponent
+        if value > self.score:
+            self.score = value
 
     def check_win(self) -> None:
         if self.won:
@@ -220,58 +226,65 @@ class Game2048(App):
 
 
 class ValentineScreen(ModalScreen):
-    HEART_FRAMES = [
-        [
-            "  **     **  ",
-            " ****   **** ",
-            "****** ******",
-            "*************",
-            " *********** ",
-            "  *********  ",
-            "    *****    ",
-            "     ***     ",
-            "      *      ",
-        ],
-        [
-            "   **   **   ",
-            "  **** ****  ",
-            " *********** ",
-            "*************",
-            " *********** ",
-            "  *********  ",
-            "    *****    ",
-            "     ***     ",
-            "      *      ",
-        ],
-        [
-            "   *** ***   ",
-            "  *********  ",
-            "*************",
-            "*************",
-            " *********** ",
-            "  *********  ",
-            "    *****    ",
-            "     ***     ",
-            "      *      ",
-        ],
-        [
-            "  **     **  ",
-            " ****   **** ",
-            "****** ******",
-            "*************",
-            " *********** ",
-            "  *********  ",
-            "    *****    ",
-            "     ***     ",
-            "      *      ",
-        ],
-    ]
+    # Each frame is 9 rows of 13 ASCII columns stored as one flat bytes
+    # blob; rows are fixed-width slices, so no per-row string objects
+    # survive past the one-time decode below.
+    _FRAME_COLS = 13
+    _FRAME_ROWS = 9
+    _FRAME_BYTES = (
+        b"  **     **  "
+        b" ****   **** "
+        b"****** ******"
+        b"*************"
+        b" *********** "
+        b"  *********  "
+        b"    *****    "
+        b"     ***     "
+        b"      *      ",
+        b"   **   **   "
+        b"  **** ****  "
+        b" *********** "
+        b"*************"
+        b" *********** "
+        b"  *********  "
+        b"    *****    "
+        b"     ***     "
+        b"      *      ",
+        b"   *** ***   "
+        b"  *********  "
+        b"*************"
+        b"*************"
+        b" *********** "
+        b"  *********  "
+        b"    *****    "
+        b"     ***     "
+        b"      *      ",
+        b"  **     **  "
+        b" ****   **** "
+        b"****** ******"
+        b"*************"
+        b" *********** "
+        b"  *********  "
+        b"    *****    "
+        b"     ***     "
+        b"      *      ",
+    )
+
+    HEART_FRAMES_RENDERED = tuple(
+        pad_lines(
+            "\n".join(
+                blob[row * 13 : (row + 1) * 13].decode("ascii") for row in range(9)
+            ),
+            9,
+        )
+        for blob in _FRAME_BYTES
+    )
 
     def compose(self) -> ComposeResult:
         with Container(classes="valentine-modal"):
             with Container(id="dialog"):
                 yield Static(
-                    pad_lines("\n".join(self.HEART_FRAMES[0]), 9),
+                    self.HEART_FRAMES_RENDERED[0],
                     id="heart",
                     classes="fill-text",
                 )
@@ -293,9 +306,8 @@ class ValentineScreen(ModalScreen):
         self.set_interval(0.3, self._animate_heart)
 
     def _animate_heart(self) -> None:
-        self._frame = (self._frame + 1) % len(self.HEART_FRAMES)
-        frame = "\n".join(self.HEART_FRAMES[self._frame])
-        self._heart.update(pad_lines(frame, 9))
+        self._frame = (self._frame + 1) % len(self.HEART_FRAMES_RENDERED)
+        self._heart.update(self.HEART_FRAMES_RENDERED[self._frame])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+/* 2048 bitboard kernels for bot / training workloads.
+ *
+ * The board is a single 64-bit word: nibble i (bits 4*i..4*i+3) holds
+ * log2(value) of the cell at row i / 4, column i % 4, with 0 for empty.
+ * Tables are built once at load time by the library constructor.
+ *
+ * Build:
+ *   cc -O2 -shared -fPIC -o _engine.so engine.c
+ *
+ * engine.py picks the library up via ctypes when _engine.so sits next
+ * to it, and falls back to the Numba / pure-Python kernels otherwise.
+ */
+#include <stdint.h>
+
+#define ROW_MASK 0xFFFFu
+
+static uint16_t row_left[65536];
+static uint16_t row_right[65536];
+static uint64_t col_up[65536];
+static uint64_t col_down[65536];
+
+static uint16_t reverse_row(uint16_t row)
+{
+    return (uint16_t)(((row & 0x000F) << 12) | ((row & 0x00F0) << 4)
+                      | ((row & 0x0F00) >> 4) | ((row & 0xF000) >> 12));
+}
+
+static uint16_t merge_row_left(uint16_t row)
+{
+    unsigned packed[4] = {0, 0, 0, 0};
+    unsigned k = 0;
+    for (unsigned c = 0; c < 4; c++) {
+        unsigned n = (row >> (4 * c)) & 0xF;
+        packed[k] = n;
+        k += n != 0;
+    }
+    uint16_t result = 0;
+    unsigned i = 0, shift = 0;
+    while (i < k) {
+        if (i + 1 < k && packed[i] == packed[i + 1]) {
+            unsigned merged = packed[i] + 1;
+            result |= (uint16_t)((merged > 0xF ? 0xF : merged) << shift);
+            i += 2;
+        } else {
+            result |= (uint16_t)(packed[i] << shift);
+            i += 1;
+        }
+        shift += 4;
+    }
+    return result;
+}
+
+static uint64_t unpack_column(uint16_t row)
+{
+    return (uint64_t)(row & 0x000F) | ((uint64_t)(row & 0x00F0) << 12)
+           | ((uint64_t)(row & 0x0F00) << 24) | ((uint64_t)(row & 0xF000) << 36);
+}
+
+__attribute__((constructor)) static void build_tables(void)
+{
+    for (uint32_t row = 0; row < 65536; row++) {
+        row_left[row] = merge_row_left((uint16_t)row);
+    }
+    for (uint32_t row = 0; row < 65536; row++) {
+        row_right[row] = reverse_row(row_left[reverse_row((uint16_t)row)]);
+        col_up[row] = unpack_column(row_left[row]);
+        col_down[row] = unpack_column(row_right[row]);
+    }
+}
+
+uint64_t transpose(uint64_t board)
+{
+    uint64_t a = (board & 0xF0F00F0FF0F00F0FULL)
+                 | ((board & 0x0000F0F00000F0F0ULL) << 12)
+                 | ((board & 0x0F0F00000F0F0000ULL) >> 12);
+    return (a & 0xFF00FF0000FF00FFULL) | ((a & 0x00FF00FF00000000ULL) >> 24)
+           | ((a & 0x00000000FF00FF00ULL) << 24);
+}
+
+uint64_t move_left(uint64_t board)
+{
+    return (uint64_t)row_left[board & ROW_MASK]
+           | ((uint64_t)row_left[(board >> 16) & ROW_MASK] << 16)
+           | ((uint64_t)row_left[(board >> 32) & ROW_MASK] << 32)
+           | ((uint64_t)row_left[(board >> 48) & ROW_MASK] << 48);
+}
+
+uint64_t move_right(uint64_t board)
+{
+    return (uint64_t)row_right[board & ROW_MASK]
+           | ((uint64_t)row_right[(board >> 16) & ROW_MASK] << 16)
+           | ((uint64_t)row_right[(board >> 32) & ROW_MASK] << 32)
+           | ((uint64_t)row_right[(board >> 48) & ROW_MASK] << 48);
+}
+
+uint64_t move_up(uint64_t board)
+{
+    uint64_t t = transpose(board);
+    return col_up[t & ROW_MASK] | (col_up[(t >> 16) & ROW_MASK] << 4)
+           | (col_up[(t >> 32) & ROW_MASK] << 8)
+           | (col_up[(t >> 48) & ROW_MASK] << 12);
+}
+
+uint64_t move_down(uint64_t board)
+{
+    uint64_t t = transpose(board);
+    return col_down[t & ROW_MASK] | (col_down[(t >> 16) & ROW_MASK] << 4)
+           | (col_down[(t >> 32) & ROW_MASK] << 8)
+           | (col_down[(t >> 48) & ROW_MASK] << 12);
+}
+
+uint64_t empty_mask(uint64_t board)
+{
+    uint64_t n = board | (board >> 1);
+    n |= n >> 2;
+    return ~n & 0x1111111111111111ULL;
+}
+
+int is_game_over(uint64_t board)
+{
+    if (empty_mask(board)) {
+        return 0;
+    }
+    return move_left(board) == board && move_right(board) == board
+           && move_up(board) == board && move_down(board) == board;
+}
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from typing import Tuple
+
+from _lut import COL_DOWN, COL_UP, ROW_LEFT, ROW_MAX, ROW_RIGHT
+
+# The board is a single 64-bit int: nibble i (bits 4*i..4*i+3) holds
+# log2(value) of the cell at row i // 4, column i % 4, with 0 for empty.
+ROW_MASK = 0xFFFF
+
+
+def transpose(board: int) -> int:
+    a = (
+        (board & 0xF0F00F0FF0F00F0F)
+        | ((board & 0x0000F0F00000F0F0) << 12)
+        | ((board & 0x0F0F00000F0F0000) >> 12)
+    )
+    return (
+        (a & 0xFF00FF0000FF00FF)
+        | ((a & 0x00FF00FF00000000) >> 24)
+        | ((a & 0x00000000FF00FF00) << 24)
+    )
+
+
+def move_left(board: int) -> int:
+    return (
+        ROW_LEFT[board & ROW_MASK]
+        | (ROW_LEFT[(board >> 16) & ROW_MASK] << 16)
+        | (ROW_LEFT[(board >> 32) & ROW_MASK] << 32)
+        | (ROW_LEFT[(board >> 48) & ROW_MASK] << 48)
+    )
+
+
+def move_right(board: int) -> int:
+    return (
+        ROW_RIGHT[board & ROW_MASK]
+        | (ROW_RIGHT[(board >> 16) & ROW_MASK] << 16)
+        | (ROW_RIGHT[(board >> 32) & ROW_MASK] << 32)
+        | (ROW_RIGHT[(board >> 48) & ROW_MASK] << 48)
+    )
+
+
+def move_up(board: int) -> int:
+    t = transpose(board)
+    return (
+        COL_UP[t & ROW_MASK]
+        | (COL_UP[(t >> 16) & ROW_MASK] << 4)
+        | (COL_UP[(t >> 32) & ROW_MASK] << 8)
+        | (COL_UP[(t >> 48) & ROW_MASK] << 12)
+    )
+
+
+def move_down(board: int) -> int:
+    t = transpose(board)
+    return (
+        COL_DOWN[t & ROW_MASK]
+        | (COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+        | (COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+        | (COL_DOWN[(t >> 48) & ROW_MASK] << 12)
+    )
+
+
+def empty_mask(board: int) -> int:
+    # SWAR: OR every nibble down onto its low bit, then invert, so bit
+    # 4 * i is set exactly where nibble i is zero.
+    n = board | (board >> 1)
+    n |= n >> 2
+    return ~n & 0x1111111111111111
+
+
+def has_empty(board: int) -> bool:
+    return empty_mask(board) != 0
+
+
+def is_game_over(board: int) -> bool:
+    if empty_mask(board):
+        return False
+    return (
+        move_left(board) == board
+        and move_right(board) == board
+        and move_up(board) == board
+        and move_down(board) == board
+    )
+
+
+def highest_exponent(board: int) -> int:
+    return max(
+        ROW_MAX[board & ROW_MASK],
+        ROW_MAX[(board >> 16) & ROW_MASK],
+        ROW_MAX[(board >> 32) & ROW_MASK],
+        ROW_MAX[(board >> 48) & ROW_MASK],
+    )
+
+
+try:
+    import numpy as np
+    from numba import boolean, njit, uint64
+except ImportError:
+    pass
+else:
+    _ROW_LEFT = np.frombuffer(ROW_LEFT, dtype=np.uint16).astype(np.uint64)
+    _ROW_RIGHT = np.frombuffer(ROW_RIGHT, dtype=np.uint16).astype(np.uint64)
+    _COL_UP = np.frombuffer(COL_UP, dtype=np.uint64)
+    _COL_DOWN = np.frombuffer(COL_DOWN, dtype=np.uint64)
+    _ROW_MAX = np.frombuffer(ROW_MAX, dtype=np.uint8).astype(np.uint64)
+
+    @njit(uint64(uint64), cache=True)
+    def transpose(board):  # type: ignore[no-redef]
+        a = (
+            (board & 0xF0F00F0FF0F00F0F)
+            | ((board & 0x0000F0F00000F0F0) << 12)
+            | ((board & 0x0F0F00000F0F0000) >> 12)
+        )
+        return (
+            (a & 0xFF00FF0000FF00FF)
+            | ((a & 0x00FF00FF00000000) >> 24)
+            | ((a & 0x00000000FF00FF00) << 24)
+        )
+
+    @njit(uint64(uint64), cache=True)
+    def move_left(board):  # type: ignore[no-redef]
+        return (
+            _ROW_LEFT[board & ROW_MASK]
+            | (_ROW_LEFT[(board >> 16) & ROW_MASK] << 16)
+            | (_ROW_LEFT[(board >> 32) & ROW_MASK] << 32)
+            | (_ROW_LEFT[(board >> 48) & ROW_MASK] << 48)
+        )
+
+    @njit(uint64(uint64), cache=True)
+    def move_right(board):  # type: ignore[no-redef]
+        return (
+            _ROW_RIGHT[board & ROW_MASK]
+            | (_ROW_RIGHT[(board >> 16) & ROW_MASK] << 16)
+            | (_ROW_RIGHT[(board >> 32) & ROW_MASK] << 32)
+            | (_ROW_RIGHT[(board >> 48) & ROW_MASK] << 48)
+        )
+
+    @njit(uint64(uint64), cache=True)
+    def move_up(board):  # type: ignore[no-redef]
+        t = transpose(board)
+        return (
+            _COL_UP[t & ROW_MASK]
+            | (_COL_UP[(t >> 16) & ROW_MASK] << 4)
+            | (_COL_UP[(t >> 32) & ROW_MASK] << 8)
+            | (_COL_UP[(t >> 48) & ROW_MASK] << 12)
+        )
+
+    @njit(uint64(uint64), cache=True)
+    def move_down(board):  # type: ignore[no-redef]
+        t = transpose(board)
+        return (
+            _COL_DOWN[t & ROW_MASK]
+            | (_COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+            | (_COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+            | (_COL_DOWN[(t >> 48) & ROW_MASK] << 12)
+        )
+
+    @njit(uint64(uint64), cache=True)
+    def empty_mask(board):  # type: ignore[no-redef]
+        n = board | (board >> 1)
+        n |= n >> 2
+        return ~n & 0x1111111111111111
+
+    @njit(boolean(uint64), cache=True)
+    def is_game_over(board):  # type: ignore[no-redef]
+        if empty_mask(board):
+            return False
+        return (
+            move_left(board) == board
+            and move_right(board) == board
+            and move_up(board) == board
+            and move_down(board) == board
+        )
+
+    @njit(uint64(uint64), cache=True)
+    def highest_exponent(board):  # type: ignore[no-redef]
+        return max(
+            _ROW_MAX[board & ROW_MASK],
+            _ROW_MAX[(board >> 16) & ROW_MASK],
+            _ROW_MAX[(board >> 32) & ROW_MASK],
+            _ROW_MAX[(board >> 48) & ROW_MASK],
+        )
+
+    def has_empty(board: int) -> bool:  # type: ignore[no-redef]
+        return empty_mask(board) != 0
+
+    # Compile at import so the first keypress does not pay JIT latency.
+    is_game_over(0)
+    highest_exponent(0)
+
+
+# A prebuilt C library outranks the JIT kernels when present; engine.c
+# documents the build command. Anything it does not export keeps the
+# binding chosen above.
+_SO_PATH = Path(__file__).with_name("_engine.so")
+if _SO_PATH.exists():
+    import ctypes
+
+    try:
+        _clib = ctypes.CDLL(str(_SO_PATH))
+    except OSError:
+        pass
+    else:
+        for _name in ("transpose", "move_left", "move_right", "move_up",
+                      "move_down", "empty_mask"):
+            _fn = getattr(_clib, _name)
+            _fn.argtypes = [ctypes.c_uint64]
+            _fn.restype = ctypes.c_uint64
+        _clib.is_game_over.argtypes = [ctypes.c_uint64]
+        _clib.is_game_over.restype = ctypes.c_bool
+
+        transpose = _clib.transpose  # type: ignore[no-redef]
+        move_left = _clib.move_left  # type: ignore[no-redef]
+        move_right = _clib.move_right  # type: ignore[no-redef]
+        move_up = _clib.move_up  # type: ignore[no-redef]
+        move_down = _clib.move_down  # type: ignore[no-redef]
+        empty_mask = _clib.empty_mask  # type: ignore[no-redef]
+        is_game_over = _clib.is_game_over  # type: ignore[no-redef]
+
+        def has_empty(board: int) -> bool:  # type: ignore[no-redef]
+            return _clib.empty_mask(board) != 0
+
+
+# AVX2 batch kernel for rollouts; engine_simd.c documents the build.
+_SIMD_PATH = Path(__file__).with_name("_engine_simd.so")
+if _SIMD_PATH.exists():
+    import ctypes
+
+    try:
+        import numpy as np
+        _simd = ctypes.CDLL(str(_SIMD_PATH))
+    except (ImportError, OSError):
+        pass
+    else:
+        _simd.move_left_batch.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_size_t,
+        ]
+        _simd.move_left_batch.restype = None
+
+        def move_left_batch(boards, out=None):
+            """Apply move_left to a NumPy uint64 array of boards."""
+            boards = np.ascontiguousarray(boards, dtype=np.uint64)
+            if out is None:
+                out = np.empty_like(boards)
+            _simd.move_left_batch(
+                boards.ctypes.data, out.ctypes.data, boards.size
+            )
+            return out
+
+
+MOVES = {
+    "up": move_up,
+    "down": move_down,
+    "left": move_left,
+    "right": move_right,
+}
+
+
+# Pure functions of the board, so the caches never need invalidating.
+# Human play rarely repeats positions, but bots and replays revisit the
+# same boards constantly.
+@functools.lru_cache(maxsize=1 << 16)
+def move(board: int, direction: str) -> Tuple[int, bool]:
+    new_board = int(MOVES[direction](board))
+    return new_board, new_board != board
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def game_over(board: int) -> bool:
+    return bool(is_game_over(board))
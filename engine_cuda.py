@@ -0,0 +1,110 @@
+"""CUDA batch move kernels for bulk board evaluation.
+
+One GPU thread per board; the move tables are copied to the device once
+on first use. The tables are too large for constant memory (512 KB as
+uint64), so they ride in global memory as kernel arguments. Nothing in
+the TUI imports this module; it exists for RL / search workloads that
+evaluate millions of boards per step.
+"""
+from __future__ import annotations
+
+import functools
+
+import numpy as np
+from numba import cuda
+
+from _lut import COL_DOWN, COL_UP, ROW_LEFT, ROW_RIGHT
+
+_ROW_LEFT = np.frombuffer(ROW_LEFT, dtype=np.uint16).astype(np.uint64)
+_ROW_RIGHT = np.frombuffer(ROW_RIGHT, dtype=np.uint16).astype(np.uint64)
+_COL_UP = np.frombuffer(COL_UP, dtype=np.uint64)
+_COL_DOWN = np.frombuffer(COL_DOWN, dtype=np.uint64)
+
+
+@cuda.jit(device=True, inline=True)
+def _transpose(board):
+    a = (
+        (board & 0xF0F00F0FF0F00F0F)
+        | ((board & 0x0000F0F00000F0F0) << 12)
+        | ((board & 0x0F0F00000F0F0000) >> 12)
+    )
+    return (
+        (a & 0xFF00FF0000FF00FF)
+        | ((a & 0x00FF00FF00000000) >> 24)
+        | ((a & 0x00000000FF00FF00) << 24)
+    )
+
+
+@cuda.jit
+def _row_move_kernel(table, boards, out):
+    i = cuda.grid(1)
+    if i < boards.size:
+        b = boards[i]
+        out[i] = (
+            table[b & 0xFFFF]
+            | (table[(b >> 16) & 0xFFFF] << 16)
+            | (table[(b >> 32) & 0xFFFF] << 32)
+            | (table[(b >> 48) & 0xFFFF] << 48)
+        )
+
+
+@cuda.jit
+def _col_move_kernel(table, boards, out):
+    i = cuda.grid(1)
+    if i < boards.size:
+        t = _transpose(boards[i])
+        out[i] = (
+            table[t & 0xFFFF]
+            | (table[(t >> 16) & 0xFFFF] << 4)
+            | (table[(t >> 32) & 0xFFFF] << 8)
+            | (table[(t >> 48) & 0xFFFF] << 12)
+        )
+
+
+_TABLES = {
+    "left": _ROW_LEFT,
+    "right": _ROW_RIGHT,
+    "up": _COL_UP,
+    "down": _COL_DOWN,
+}
+_KERNELS = {
+    "left": _row_move_kernel,
+    "right": _row_move_kernel,
+    "up": _col_move_kernel,
+    "down": _col_move_kernel,
+}
+
+
+@functools.cache
+def _device_table(direction: str):
+    return cuda.to_device(_TABLES[direction])
+
+
+def move_batch(boards, direction: str, out=None):
+    """Apply one move to a NumPy uint64 array of boards on the GPU."""
+    boards = np.ascontiguousarray(boards, dtype=np.uint64)
+    if out is None:
+        out = np.empty_like(boards)
+    d_in = cuda.to_device(boards)
+    d_out = cuda.device_array_like(boards)
+    threads = 256
+    blocks = (boards.size + threads - 1) // threads
+    _KERNELS[direction][blocks, threads](_device_table(direction), d_in, d_out)
+    d_out.copy_to_host(out)
+    return out
+
+
+def move_left_batch(boards, out=None):
+    return move_batch(boards, "left", out)
+
+
+def move_right_batch(boards, out=None):
+    return move_batch(boards, "right", out)
+
+
+def move_up_batch(boards, out=None):
+    return move_batch(boards, "up", out)
+
+
+def move_down_batch(boards, out=None):
+    return move_batch(boards, "down", out)